@@ -11,14 +11,30 @@ Implements hierarchical context layers for recursive language model.
 - **Layer 4 (Year)**: Yearly summaries
 """
 
+import asyncio
+import dataclasses
+import hashlib
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import string
+from collections import Counter, deque
+from itertools import islice
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Maps ASCII and common CJK punctuation to spaces for tokenization
+_PUNCTUATION = str.maketrans({ch: " " for ch in string.punctuation + "，。！？；：、（）《》“”‘’"})
+
+
+def tokenize(text: str) -> set:
+    """Split text into a set of lowercase, punctuation-free tokens"""
+    return set(text.lower().translate(_PUNCTUATION).split())
+
 
 class ContextLayer(Enum):
     """Context layer types"""
@@ -31,29 +47,33 @@ class ContextLayer(Enum):
     @property
     def time_span_hours(self) -> int:
         """Get time span in hours for this layer"""
-        spans = {
-            ContextLayer.RAW: 24,      # Last 24 hours (raw events)
-            ContextLayer.DAY: 24,      # 1 day
-            ContextLayer.WEEK: 168,    # 7 days
-            ContextLayer.MONTH: 720,   # 30 days
-            ContextLayer.YEAR: 8760,   # 365 days
-        }
-        return spans[self]
+        return _LAYER_SPANS[self]
 
     @property
     def capacity(self) -> int:
         """Maximum number of items in this layer"""
-        capacities = {
-            ContextLayer.RAW: 100,
-            ContextLayer.DAY: 30,     # Last 30 days
-            ContextLayer.WEEK: 52,    # Last 52 weeks
-            ContextLayer.MONTH: 24,   # Last 24 months
-            ContextLayer.YEAR: 10,    # Last 10 years
-        }
-        return capacities[self]
+        return _LAYER_CAPACITIES[self]
+
+
+# Layer constants, built once rather than on every property access
+_LAYER_SPANS = {
+    ContextLayer.RAW: 24,      # Last 24 hours (raw events)
+    ContextLayer.DAY: 24,      # 1 day
+    ContextLayer.WEEK: 168,    # 7 days
+    ContextLayer.MONTH: 720,   # 30 days
+    ContextLayer.YEAR: 8760,   # 365 days
+}
 
+_LAYER_CAPACITIES = {
+    ContextLayer.RAW: 100,
+    ContextLayer.DAY: 30,     # Last 30 days
+    ContextLayer.WEEK: 52,    # Last 52 weeks
+    ContextLayer.MONTH: 24,   # Last 24 months
+    ContextLayer.YEAR: 10,    # Last 10 years
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class ContextSummary:
     """A context summary at a specific layer"""
     layer: ContextLayer
@@ -62,8 +82,20 @@ class ContextSummary:
     metadata: Dict[str, Any] = field(default_factory=dict)
     token_count: int = 0
 
+    def render_for_llm(self) -> str:
+        """Format as a line of LLM context"""
+        return f"[{self.timestamp:%Y-%m-%d} Summary] {self.content}"
+
+    def render_for_answer(self) -> str:
+        """Format as a bullet in a plain-text answer"""
+        return f"• {self.timestamp:%Y-%m-%d} (summary): {self.content}"
 
-@dataclass
+    def render_for_summary(self) -> str:
+        """Format as input to a higher-layer summary"""
+        return self.content
+
+
+@dataclass(slots=True)
 class ContextItem:
     """A single context item (event)"""
     timestamp: datetime
@@ -72,6 +104,51 @@ class ContextItem:
     metadata: Dict[str, Any] = field(default_factory=dict)
     token_count: int = 0
 
+    def render_for_llm(self) -> str:
+        """Format as a line of LLM context"""
+        return f"[{self.timestamp:%Y-%m-%d %H:%M}] {self.event_type}: {self.content}"
+
+    def render_for_answer(self) -> str:
+        """Format as a bullet in a plain-text answer"""
+        return f"• {self.timestamp:%Y-%m-%d}: {self.content}"
+
+    def render_for_summary(self) -> str:
+        """Format as input to a higher-layer summary"""
+        return f"[{self.event_type}] {self.content}"
+
+
+def _to_datetime64(value: datetime) -> np.datetime64:
+    """Convert a datetime to datetime64[s] (timezone-aware values as UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "s")
+
+
+def _week_starts(days: np.ndarray) -> np.ndarray:
+    """Truncate datetime64[D] values to the Monday of their week"""
+    # 1970-01-05 was a Monday
+    return days - (days - np.datetime64("1970-01-05")) % np.timedelta64(7, "D")
+
+
+# Truncation of datetime64 timestamps to the start of each layer's period
+_PERIOD_TRUNCATE = {
+    ContextLayer.DAY: lambda ts: ts.astype("datetime64[D]"),
+    ContextLayer.WEEK: lambda ts: _week_starts(ts.astype("datetime64[D]")),
+    ContextLayer.MONTH: lambda ts: ts.astype("datetime64[M]"),
+    ContextLayer.YEAR: lambda ts: ts.astype("datetime64[Y]"),
+}
+
+
+def _period_starts(timestamps: np.ndarray, target_layer: ContextLayer) -> np.ndarray:
+    """
+    Truncate datetime64 timestamps to the start of their period for a layer
+    (day, Monday-based week, month or year), returned as datetime64[us] so
+    that individual values convert to datetime objects
+    """
+    truncate = _PERIOD_TRUNCATE.get(target_layer)
+    starts = truncate(timestamps) if truncate else timestamps
+    return starts.astype("datetime64[us]")
+
 
 class RecursiveContext:
     """
@@ -95,6 +172,9 @@ class RecursiveContext:
     include higher layers until we reach the token budget.
     """
 
+    # Maximum number of memoized summaries kept across all layers
+    SUMMARY_CACHE_SIZE = 512
+
     def __init__(self, user_id: str):
         """
         Initialize recursive context for a user
@@ -103,10 +183,29 @@ class RecursiveContext:
             user_id: User identifier
         """
         self.user_id = user_id
-        self.layers: Dict[ContextLayer, List[Any]] = {
-            layer: [] for layer in ContextLayer
+        # RAW is a bounded ring buffer: appends are O(1) and the oldest
+        # events are evicted automatically once capacity is reached
+        self.layers: Dict[ContextLayer, Any] = {
+            layer: deque(maxlen=layer.capacity) if layer == ContextLayer.RAW else []
+            for layer in ContextLayer
         }
         self.last_updated: Dict[ContextLayer, datetime] = {}
+        # Hash of each layer's source items when it was last summarized
+        self._layer_hashes: Dict[ContextLayer, str] = {}
+        # Per-layer columns (SoA): datetime64[s] timestamps and token-count
+        # prefix sums, rebuilt lazily for layers marked dirty
+        self._ts: Dict[ContextLayer, np.ndarray] = {}
+        self._tok_prefix: Dict[ContextLayer, np.ndarray] = {}
+        # Whether each layer's timestamps are in chronological order
+        self._sorted: Dict[ContextLayer, bool] = {}
+        self._dirty: set = set(ContextLayer)
+        # Incremented on every mutation; identifies a snapshot of the context
+        self.version = 0
+        # Inverted index over RAW events: token -> ids of items containing it
+        self._inverted: Dict[str, set] = {}
+        self._item_tokens: Dict[int, set] = {}
+        # Memoized summaries keyed by a hash of layer, period and source content
+        self._summary_cache: Dict[str, ContextSummary] = {}
 
     def add_raw_event(self, event: ContextItem) -> None:
         """
@@ -115,21 +214,59 @@ class RecursiveContext:
         Args:
             event: ContextItem to add
         """
-        self.layers[ContextLayer.RAW].append(event)
+        raw = self.layers[ContextLayer.RAW]
+        if len(raw) == raw.maxlen:
+            self._unindex(raw[0])
 
-        # Keep only the most recent events
-        capacity = ContextLayer.RAW.capacity
-        if len(self.layers[ContextLayer.RAW]) > capacity:
-            self.layers[ContextLayer.RAW] = self.layers[ContextLayer.RAW][-capacity:]
+        # Oldest events are evicted by the deque's maxlen
+        raw.append(event)
+        self._index(event)
+        self._dirty.add(ContextLayer.RAW)
+        self.version += 1
 
         self.last_updated[ContextLayer.RAW] = datetime.now()
 
+    def _index(self, item: ContextItem) -> None:
+        """Add an item's tokens to the inverted index"""
+        tokens = tokenize(str(item.content))
+        self._item_tokens[id(item)] = tokens
+        for token in tokens:
+            self._inverted.setdefault(token, set()).add(id(item))
+
+    def _unindex(self, item: ContextItem) -> None:
+        """Remove an item's tokens from the inverted index"""
+        for token in self._item_tokens.pop(id(item), ()):
+            postings = self._inverted.get(token)
+            if postings is not None:
+                postings.discard(id(item))
+                if not postings:
+                    del self._inverted[token]
+
+    def match_counts(self, tokens: Iterable[str]) -> Counter:
+        """
+        Count matching tokens per indexed RAW event
+
+        Args:
+            tokens: Query tokens (as produced by tokenize())
+
+        Returns:
+            Counter keyed by id(item) of indexed items sharing at least one token
+        """
+        hits: Counter = Counter()
+        for token in tokens:
+            hits.update(self._inverted.get(token, ()))
+        return hits
+
+    def is_indexed(self, item: Any) -> bool:
+        """Check whether an item is covered by the inverted index (RAW events)"""
+        return id(item) in self._item_tokens
+
     def get_context_for_query(
         self,
         max_tokens: int = 4000,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
-    ) -> List[Any]:
+    ) -> Tuple[List[Any], List[ContextLayer]]:
         """
         Get context items for a query, respecting token budget
 
@@ -142,71 +279,125 @@ class RecursiveContext:
             end_date: Filter events before this date
 
         Returns:
-            List of context items (ContextItem or ContextSummary)
+            Tuple of (context items (ContextItem or ContextSummary),
+            layers that contributed items, most detailed first)
         """
         context_items = []
+        layers_touched = []
         tokens_used = 0
 
         # Process layers from most detailed to least detailed
         for layer in [ContextLayer.RAW, ContextLayer.DAY, ContextLayer.WEEK,
                       ContextLayer.MONTH, ContextLayer.YEAR]:
             items = self.layers[layer]
+            if not items:
+                continue
+            prefix = self._columns(layer)[1]
+            remaining = max_tokens - tokens_used
 
             # Filter by date range if specified
             if start_date or end_date:
-                items = self._filter_by_date(items, start_date, end_date)
-
-            # Add items until we reach token limit
-            for item in items:
-                item_tokens = getattr(item, 'token_count', 100)  # Default estimate
-
-                if tokens_used + item_tokens > max_tokens:
-                    break
+                selection = self._filter_by_date(layer, start_date, end_date)
+            else:
+                selection = slice(0, len(items))
+
+            # Add the longest run of items that fits in the remaining budget
+            if isinstance(selection, slice):
+                lo, hi = selection.start, selection.stop
+                base = int(prefix[lo - 1]) if lo > 0 else 0
+                cut = int(np.searchsorted(prefix[lo:hi], base + remaining, side="right"))
+                context_items.extend(islice(items, lo, lo + cut))
+                tokens_used += int(prefix[lo + cut - 1]) - base if cut else 0
+            else:
+                selected_prefix = np.cumsum(np.diff(prefix, prepend=0)[selection])
+                cut = int(np.searchsorted(selected_prefix, remaining, side="right"))
+                items = list(items)
+                context_items.extend(items[i] for i in selection[:cut])
+                tokens_used += int(selected_prefix[cut - 1]) if cut else 0
 
-                context_items.append(item)
-                tokens_used += item_tokens
+            if cut:
+                layers_touched.append(layer)
 
             # Stop if we've used up our token budget
             if tokens_used >= max_tokens * 0.95:  # 95% threshold
                 break
 
         logger.info(f"Retrieved {len(context_items)} context items using {tokens_used} tokens")
-        return context_items
+        return context_items, layers_touched
+
+    def _columns(self, layer: ContextLayer) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a layer's columns: datetime64[s] timestamps and the running
+        (prefix) sum of token counts
+
+        Rebuilt only when the layer is dirty, together with the layer's
+        sortedness flag, so queries do no per-item work in Python.
+        """
+        if layer in self._dirty:
+            items = self.layers[layer]
+            self._ts[layer] = np.array(
+                [_to_datetime64(item.timestamp) for item in items],
+                dtype="datetime64[s]"
+            )
+            self._tok_prefix[layer] = np.cumsum(np.fromiter(
+                (getattr(item, 'token_count', 100) for item in items),  # Default estimate
+                dtype=np.int64,
+                count=len(items)
+            ))
+            ts = self._ts[layer]
+            self._sorted[layer] = bool(np.all(ts[1:] >= ts[:-1]))
+            self._dirty.discard(layer)
+        return self._ts[layer], self._tok_prefix[layer]
 
     def _filter_by_date(
         self,
-        items: List[Any],
+        layer: ContextLayer,
         start_date: Optional[datetime],
         end_date: Optional[datetime]
-    ) -> List[Any]:
-        """Filter items by date range"""
-        if not start_date and not end_date:
-            return items
+    ) -> Union[slice, np.ndarray]:
+        """
+        Select a layer's items by date range
 
-        filtered = []
-        for item in items:
-            item_date = item.timestamp
+        Layers are normally in chronological order, so the range is found
+        with two binary searches over the timestamp array and returned as a
+        slice. Unsorted layers fall back to a vectorized mask and return the
+        matching indices.
+        """
+        ts = self._columns(layer)[0]
+        if not start_date and not end_date:
+            return slice(0, len(ts))
 
-            if start_date and item_date < start_date:
-                continue
-            if end_date and item_date > end_date:
-                continue
+        start = _to_datetime64(start_date) if start_date else None
+        end = _to_datetime64(end_date) if end_date else None
 
-            filtered.append(item)
+        if self._sorted[layer]:
+            lo = int(np.searchsorted(ts, start, "left")) if start is not None else 0
+            hi = int(np.searchsorted(ts, end, "right")) if end is not None else len(ts)
+            return slice(lo, max(lo, hi))
 
-        return filtered
+        mask = np.ones(len(ts), dtype=bool)
+        if start is not None:
+            mask &= ts >= start
+        if end is not None:
+            mask &= ts <= end
+        return np.flatnonzero(mask)
 
     async def summarize_layer(
         self,
         target_layer: ContextLayer,
-        llm_client: Any
+        llm_client: Any,
+        max_concurrency: int = 8
     ) -> List[ContextSummary]:
         """
         Generate summaries for a specific layer
 
+        Groups are independent, so their summaries are generated
+        concurrently (bounded by max_concurrency to avoid rate-limit bursts).
+
         Args:
             target_layer: Layer to generate summaries for
             llm_client: LLM client for generating summaries
+            max_concurrency: Maximum number of in-flight summary requests
 
         Returns:
             List of generated summaries
@@ -217,6 +408,7 @@ class RecursiveContext:
             ContextLayer.DAY,
             ContextLayer.WEEK,
             ContextLayer.MONTH,
+            ContextLayer.YEAR,
         ]
 
         try:
@@ -236,60 +428,68 @@ class RecursiveContext:
             return []
 
         # Group source items by time period
-        groups = self._group_by_time_period(source_items, target_layer)
-
-        # Generate summary for each group
-        summaries = []
-        for period_start, items in groups.items():
-            summary = await self._generate_summary(
-                items=items,
-                layer=target_layer,
-                period_start=period_start,
-                llm_client=llm_client
-            )
-            summaries.append(summary)
+        groups = self._group_by_time_period(source_layer, target_layer)
+
+        # Generate summary for each group concurrently (groups and results
+        # are in chronological order)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def summarize_group(period_start: datetime, items: List[Any]) -> ContextSummary:
+            async with semaphore:
+                return await self._generate_summary(
+                    items=items,
+                    layer=target_layer,
+                    period_start=period_start,
+                    llm_client=llm_client
+                )
+
+        summaries = list(await asyncio.gather(*(
+            summarize_group(period_start, items)
+            for period_start, items in groups
+        )))
 
         # Store summaries
         self.layers[target_layer] = summaries
+        self._dirty.add(target_layer)
+        self.version += 1
         self.last_updated[target_layer] = datetime.now()
 
         return summaries
 
     def _group_by_time_period(
         self,
-        items: List[Any],
+        source_layer: ContextLayer,
         target_layer: ContextLayer
-    ) -> Dict[datetime, List[Any]]:
-        """Group items by time period based on target layer"""
-        groups = {}
-
-        for item in items:
-            item_date = item.timestamp
-
-            # Determine period start based on layer
-            if target_layer == ContextLayer.DAY:
-                # Group by day
-                period_start = item_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif target_layer == ContextLayer.WEEK:
-                # Group by week (Monday)
-                days_since_monday = item_date.weekday()
-                period_start = (item_date - timedelta(days=days_since_monday)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                )
-            elif target_layer == ContextLayer.MONTH:
-                # Group by month
-                period_start = item_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            elif target_layer == ContextLayer.YEAR:
-                # Group by year
-                period_start = item_date.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-            else:
-                period_start = item_date
+    ) -> List[Tuple[datetime, List[Any]]]:
+        """
+        Group a layer's items by time period based on target layer
+
+        Period starts are computed for the whole layer at once by truncating
+        its datetime64 timestamp column (timezone-aware timestamps in UTC).
+        Layers are normally chronological, so each group is a contiguous run
+        of equal period starts; unsorted layers are stable-sorted first.
+
+        Returns:
+            List of (period_start, items) in chronological order
+        """
+        items = list(self.layers[source_layer])
+        if not items:
+            return []
 
-            if period_start not in groups:
-                groups[period_start] = []
-            groups[period_start].append(item)
+        period_starts = _period_starts(self._columns(source_layer)[0], target_layer)
 
-        return groups
+        # Truncation preserves order, so sorted timestamps give sorted periods
+        if not self._sorted[source_layer]:
+            order = np.argsort(period_starts, kind="stable")
+            period_starts = period_starts[order]
+            items = [items[i] for i in order]
+
+        # Split wherever the period start changes
+        bounds = (np.flatnonzero(period_starts[1:] != period_starts[:-1]) + 1).tolist()
+        return [
+            (period_starts[lo].item(), items[lo:hi])
+            for lo, hi in zip([0] + bounds, bounds + [len(items)])
+        ]
 
     async def _generate_summary(
         self,
@@ -300,20 +500,23 @@ class RecursiveContext:
     ) -> ContextSummary:
         """Generate a summary for a group of items"""
         # Concatenate item contents
-        content_parts = []
-        for item in items:
-            if isinstance(item, ContextItem):
-                content_parts.append(f"[{item.event_type}] {item.content}")
-            elif isinstance(item, ContextSummary):
-                content_parts.append(item.content)
-
-        combined_content = "\n".join(content_parts)
+        combined_content = "\n".join(item.render_for_summary() for item in items)
+
+        # Identical source content for the same period summarizes identically;
+        # reuse it instead of calling the LLM again
+        cache_key = hashlib.blake2b(
+            f"{layer.value}\0{period_start.isoformat()}\0{combined_content}".encode(),
+            digest_size=16
+        ).hexdigest()
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            return dataclasses.replace(cached, metadata=dict(cached.metadata))
 
         # For V1, use simple summarization (V2 will use LLM)
         # This is a placeholder that would call the LLM in full implementation
         summary_text = f"Summary of {len(items)} items from {period_start.strftime('%Y-%m-%d')}"
 
-        return ContextSummary(
+        summary = ContextSummary(
             layer=layer,
             timestamp=period_start,
             content=summary_text,
@@ -324,6 +527,13 @@ class RecursiveContext:
             token_count=len(summary_text.split())
         )
 
+        self._summary_cache[cache_key] = summary
+        if len(self._summary_cache) > self.SUMMARY_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._summary_cache[next(iter(self._summary_cache))]
+
+        return dataclasses.replace(summary, metadata=dict(summary.metadata))
+
     def estimate_tokens(self, text: str) -> int:
         """
         Estimate token count for text
@@ -334,5 +544,23 @@ class RecursiveContext:
         Returns:
             Estimated token count
         """
-        # Simple estimation: ~1 token per 4 characters
-        return len(text) // 4
+        # Simple estimation: ~1 token per 4 UTF-8 bytes (rounded up), so CJK
+        # text (3 bytes per character) is not undercounted
+        return (len(text.encode("utf-8")) + 3) >> 2
+
+    def estimate_tokens_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Estimate token counts for many texts at once
+
+        Args:
+            texts: Texts to estimate
+
+        Returns:
+            int32 array of estimated token counts (same rule as estimate_tokens)
+        """
+        byte_lengths = np.fromiter(
+            (len(text.encode("utf-8")) for text in texts),
+            dtype=np.int32,
+            count=len(texts)
+        )
+        return (byte_lengths + 3) >> 2
@@ -5,8 +5,12 @@ Manages the full RLM pipeline including context building,
 summarization, and querying.
 """
 
+import asyncio
+import hashlib
 import logging
+from collections.abc import Mapping
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional
 
 from .context import RecursiveContext, ContextLayer, ContextItem
@@ -15,6 +19,62 @@ from .query import QueryEngine, QueryResult
 logger = logging.getLogger(__name__)
 
 
+class _LayerInfo(Mapping):
+    """Read-only view of per-layer item counts, computed on access"""
+
+    def __init__(self, context: RecursiveContext):
+        self._context = context
+
+    def __getitem__(self, key: str) -> Dict[str, int]:
+        try:
+            layer = ContextLayer(key)
+        except ValueError:
+            raise KeyError(key) from None
+        return {
+            "count": len(self._context.layers[layer]),
+            "capacity": layer.capacity
+        }
+
+    def __iter__(self):
+        return (layer.value for layer in ContextLayer)
+
+    def __len__(self) -> int:
+        return len(ContextLayer)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class _ContextInfo(Mapping):
+    """Read-only view of a user's context information, computed on access"""
+
+    def __init__(self, user_id: str, context: RecursiveContext, engine: Optional[QueryEngine]):
+        self._user_id = user_id
+        self._context = context
+        self._engine = engine
+        self._keys = ("user_id", "layers", "last_updated") + (("query_stats",) if engine else ())
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "user_id":
+            return self._user_id
+        if key == "layers":
+            return _LayerInfo(self._context)
+        if key == "last_updated":
+            return MappingProxyType(self._context.last_updated)
+        if key == "query_stats" and self._engine:
+            return self._engine.get_query_stats()
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 class RLMManager:
     """
     Main manager for Recursive Language Model functionality
@@ -39,16 +99,22 @@ class RLMManager:
     ```
     """
 
-    def __init__(self, api_client: Any):
+    def __init__(self, api_client: Any, llm_client: Optional[Any] = None):
         """
         Initialize RLM manager
 
         Args:
             api_client: DirSoul API client (or compatible HTTP client)
+            llm_client: LLM client for summarizing higher context layers
+                (optional; without one only RAW events are kept)
         """
         self.api_client = api_client
+        self.llm_client = llm_client
         self.contexts: Dict[str, RecursiveContext] = {}
         self.query_engines: Dict[str, QueryEngine] = {}
+        # Bumped by clear_context; builds started in an older generation
+        # are discarded instead of finishing
+        self._generations: Dict[str, int] = {}
 
     def get_context(self, user_id: str) -> RecursiveContext:
         """Get or create context for user"""
@@ -75,6 +141,7 @@ class RLMManager:
             Number of events processed
         """
         context = self.get_context(user_id)
+        generation = self._generations.get(user_id, 0)
 
         # Check if context is already built
         if not force_refresh and context.last_updated.get(ContextLayer.RAW):
@@ -98,30 +165,25 @@ class RLMManager:
             logger.error(f"Failed to fetch timeline: {e}")
             return 0
 
-        # Process events and add to context
-        event_count = 0
-        for date, events in timeline_data.get("events_by_date", {}).items():
-            for event in events:
-                # Convert timeline event to ContextItem
-                item = ContextItem(
-                    timestamp=datetime.fromisoformat(event["timestamp"]),
-                    content=self._format_event_content(event),
-                    event_type=event.get("action", "unknown"),
-                    metadata={
-                        "event_id": event.get("event_id"),
-                        "actor": event.get("actor"),
-                        "target": event.get("target"),
-                        "quantity": event.get("quantity"),
-                        "confidence": event.get("confidence")
-                    }
-                )
-
-                # Estimate token count
-                item.token_count = context.estimate_tokens(item.content)
-
-                # Add to context
-                context.add_raw_event(item)
-                event_count += 1
+        if self._cleared_since(user_id, generation):
+            return 0
+
+        # Parse events off the event loop in a worker thread. The API groups
+        # events by date in no particular order, so dates are flattened oldest
+        # first; _parse_events sorts the batch, keeping the RAW layer
+        # chronological.
+        events = [
+            event
+            for _, day_events in sorted(timeline_data.get("events_by_date", {}).items())
+            for event in day_events
+        ]
+        items = await asyncio.to_thread(self._parse_events, events, context)
+        for item in items:
+            context.add_raw_event(item)
+        event_count = len(items)
+
+        if self._cleared_since(user_id, generation):
+            return 0
 
         logger.info(f"Built context with {event_count} events for user {user_id}")
 
@@ -185,20 +247,79 @@ class RLMManager:
         Args:
             user_id: User identifier
         """
-        context = self.get_context(user_id)
+        # Summaries need a real LLM; without one the higher layers would only
+        # fill with placeholder text that competes with RAW events for tokens
+        if self.llm_client is None:
+            logger.debug(f"No LLM client, skipping summary generation for user {user_id}")
+            return
 
-        # For V1, we'll skip actual summarization
-        # In V2, this would:
-        # 1. Summarize RAW events into daily summaries
-        # 2. Summarize daily summaries into weekly summaries
-        # 3. And so on...
+        context = self.get_context(user_id)
 
-        logger.info(f"Summary generation for user {user_id} - V1 (placeholder)")
+        # Each layer summarizes the one below it, so the cascade runs in order
+        # (groups within a layer are summarized concurrently). Layers whose
+        # source items are unchanged since the last run are skipped.
+        cascade = [
+            (ContextLayer.RAW, ContextLayer.DAY),
+            (ContextLayer.DAY, ContextLayer.WEEK),
+            (ContextLayer.WEEK, ContextLayer.MONTH),
+            (ContextLayer.MONTH, ContextLayer.YEAR),
+        ]
+
+        for source_layer, target_layer in cascade:
+            source_hash = self._hash_layer(context.layers[source_layer])
+            if context._layer_hashes.get(target_layer) == source_hash:
+                logger.debug(f"Layer {target_layer.value} unchanged for user {user_id}, skipping")
+                continue
+
+            summaries = await context.summarize_layer(target_layer, self.llm_client)
+            context._layer_hashes[target_layer] = source_hash
+            logger.info(f"Generated {len(summaries)} {target_layer.value} summaries for user {user_id}")
+
+    @staticmethod
+    def _hash_layer(items: List[Any]) -> str:
+        """Version hash of a layer's items (timestamps and contents)"""
+        digest = hashlib.md5()
+        for item in items:
+            digest.update(f"{item.timestamp.isoformat()}\0{item.content}\0".encode())
+        return digest.hexdigest()
+
+    def _cleared_since(self, user_id: str, generation: int) -> bool:
+        """Check whether the user's context was cleared after a build started"""
+        if self._generations.get(user_id, 0) != generation:
+            logger.info(f"Context for user {user_id} was cleared during build, discarding")
+            return True
+        return False
+
+    def _parse_events(
+        self,
+        events: List[Dict[str, Any]],
+        context: RecursiveContext
+    ) -> List[ContextItem]:
+        """Convert timeline events to ContextItems, sorted by timestamp"""
+        # Build the content column first so token counts are estimated for
+        # the whole batch in one vectorized call
+        contents = [self._format_event_content(event) for event in events]
+        token_counts = context.estimate_tokens_batch(contents).tolist()
+
+        items = [
+            ContextItem(
+                timestamp=datetime.fromisoformat(event["timestamp"]),
+                content=content,
+                event_type=event.get("action", "unknown"),
+                metadata={
+                    "event_id": event.get("event_id"),
+                    "actor": event.get("actor"),
+                    "target": event.get("target"),
+                    "quantity": event.get("quantity"),
+                    "confidence": event.get("confidence")
+                },
+                token_count=token_count
+            )
+            for event, content, token_count in zip(events, contents, token_counts)
+        ]
 
-        # Placeholder: In V2, call context.summarize_layer() for each layer
-        # await context.summarize_layer(ContextLayer.DAY, llm_client)
-        # await context.summarize_layer(ContextLayer.WEEK, llm_client)
-        # ...
+        items.sort(key=lambda item: item.timestamp)
+        return items
 
     def _format_event_content(self, event: Dict[str, Any]) -> str:
         """Format event as human-readable string"""
@@ -218,47 +339,35 @@ class RLMManager:
 
         return " ".join(parts)
 
-    def get_context_info(self, user_id: str) -> Dict[str, Any]:
+    def get_context_info(self, user_id: str) -> Mapping:
         """
         Get information about user's context
 
+        The result is a read-only view: layer counts and query stats are
+        computed when accessed, and last_updated cannot be mutated through it.
+
         Args:
             user_id: User identifier
 
         Returns:
-            Context information
+            Context information (user_id, layers, last_updated, query_stats)
         """
         context = self.get_context(user_id)
-        engine = self.query_engines.get(user_id)
-
-        info = {
-            "user_id": user_id,
-            "layers": {},
-            "last_updated": context.last_updated,
-        }
-
-        for layer in ContextLayer:
-            items = context.layers.get(layer, [])
-            info["layers"][layer.value] = {
-                "count": len(items),
-                "capacity": layer.capacity
-            }
-
-        if engine:
-            info["query_stats"] = engine.get_query_stats()
-
-        return info
+        return _ContextInfo(user_id, context, self.query_engines.get(user_id))
 
     def clear_context(self, user_id: str) -> None:
         """
         Clear all context data for a user
 
+        Bumps the user's generation so any build still in progress is
+        discarded instead of repopulating the cleared context.
+
         Args:
             user_id: User identifier
         """
-        if user_id in self.contexts:
-            del self.contexts[user_id]
-        if user_id in self.query_engines:
-            del self.query_engines[user_id]
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+        self.contexts.pop(user_id, None)
+        self.query_engines.pop(user_id, None)
 
         logger.info(f"Cleared context for user {user_id}")
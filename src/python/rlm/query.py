@@ -9,17 +9,22 @@ Handles querying across hierarchical context layers with recursive expansion.
 3. Continue expanding until answer found or context exhausted
 """
 
+import hashlib
+import inspect
 import logging
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
-from .context import RecursiveContext, ContextLayer, ContextItem, ContextSummary
+import numpy as np
+
+from .context import RecursiveContext, ContextLayer, tokenize
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResult:
     """Result of a query"""
     answer: str
@@ -39,8 +44,24 @@ class QueryEngine:
     2. Search across context layers (from detailed to summary)
     3. Recursively expand search if answer not found
     4. Return result with context used
+
+    # Response Cache
+    LLM answers are cached per context snapshot (context version + query
+    parameters). Exact repeats hit on the question hash; near-duplicate
+    questions hit on embedding cosine similarity when the LLM client
+    provides `embed()`. Only deterministic (temperature 0) clients are cached.
+
+    # Context Ranking
+    When more than LLM_TOP_K items are retrieved and the LLM client provides
+    `embed_batch()`, all items are embedded in one call (the question reuses
+    its cache embedding when one was computed) and only the LLM_TOP_K most
+    similar items are sent to the LLM.
     """
 
+    CACHE_CAPACITY = 512
+    SIMILARITY_THRESHOLD = 0.97
+    LLM_TOP_K = 20
+
     def __init__(self, context: RecursiveContext):
         """
         Initialize query engine
@@ -49,11 +70,14 @@ class QueryEngine:
             context: RecursiveContext to query
         """
         self.context = context
-        self.query_stats: Dict[str, Any] = {
-            "total_queries": 0,
-            "layers_used": [],
-            "avg_tokens": 0
-        }
+        self.query_stats: Dict[str, Any] = {"total_queries": 0}
+        # Constant-size running stats: token total and per-layer access counts
+        self._tokens_sum = 0
+        self._layers_counter: Counter = Counter()
+        # cache key -> answer, in LRU order
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        # cache key -> (context scope, normalized question embedding)
+        self._cache_embeddings: Dict[str, Tuple[str, np.ndarray]] = {}
 
     async def query(
         self,
@@ -79,7 +103,7 @@ class QueryEngine:
         self.query_stats["total_queries"] += 1
 
         # Step 1: Get context within token budget
-        context_items = self.context.get_context_for_query(
+        context_items, layers_accessed = self.context.get_context_for_query(
             max_tokens=max_tokens,
             start_date=start_date,
             end_date=end_date
@@ -101,31 +125,40 @@ class QueryEngine:
             for item in context_items
         )
 
-        # Step 3: Track which layers were accessed
-        layers_accessed = list(set(
-            getattr(item, 'layer', ContextLayer.RAW)
-            for item in context_items
-            if hasattr(item, 'layer')
-        )) or [ContextLayer.RAW]
-
-        # Step 4: Generate answer (V1: simple, V2: with LLM)
+        # Step 3: Generate answer (V1: simple, V2: with LLM)
+        cache_hit = False
         if llm_client:
-            answer = await self._answer_with_llm(
-                question=question,
-                context=context_items,
-                llm_client=llm_client
-            )
+            answer = None
+            q_emb = None
+            cacheable = getattr(llm_client, "temperature", None) == 0
+            if cacheable:
+                scope = f"{self.context.version}:{max_tokens}:{start_date}:{end_date}"
+                cache_key = hashlib.sha256(f"{scope}\0{question}".encode()).hexdigest()
+                answer = self._cache.get(cache_key)
+                if answer is not None:
+                    self._cache.move_to_end(cache_key)
+                else:
+                    q_emb = await self._embed_question(question, llm_client)
+                    answer = self._lookup_similar(scope, q_emb)
+                cache_hit = answer is not None
+
+            if answer is None:
+                answer = await self._answer_with_llm(
+                    question=question,
+                    context_items=context_items,
+                    llm_client=llm_client,
+                    q_emb=q_emb
+                )
+                if cacheable:
+                    self._cache_answer(cache_key, scope, q_emb, answer)
             confidence = 0.7  # V2: Calculate based on context relevance
         else:
             answer = self._answer_simple(question, context_items)
             confidence = 0.5  # Lower confidence without LLM
 
         # Update stats
-        self.query_stats["layers_used"].extend(layers_accessed)
-        self.query_stats["avg_tokens"] = (
-            (self.query_stats["avg_tokens"] * (self.query_stats["total_queries"] - 1) + tokens_used) /
-            self.query_stats["total_queries"]
-        )
+        self._tokens_sum += tokens_used
+        self._layers_counter.update(layers_accessed)
 
         return QueryResult(
             answer=answer,
@@ -135,10 +168,58 @@ class QueryEngine:
             confidence=confidence,
             metadata={
                 "items_count": len(context_items),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now().isoformat(),
+                "cache_hit": cache_hit
             }
         )
 
+    async def _embed_question(self, question: str, llm_client: Any) -> Optional[np.ndarray]:
+        """Embed a question for similarity lookup (None if unsupported)"""
+        embed = getattr(llm_client, "embed", None)
+        if embed is None:
+            return None
+
+        try:
+            embedding = embed(question)
+            if inspect.isawaitable(embedding):
+                embedding = await embedding
+        except Exception as e:
+            logger.warning(f"Question embedding failed, skipping similarity cache: {e}")
+            return None
+
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _lookup_similar(self, scope: str, q_emb: Optional[np.ndarray]) -> Optional[str]:
+        """Find a cached answer for a near-identical question in the same scope"""
+        if q_emb is None:
+            return None
+
+        for key, (entry_scope, emb) in self._cache_embeddings.items():
+            if entry_scope == scope and emb.shape == q_emb.shape:
+                if float(emb @ q_emb) >= self.SIMILARITY_THRESHOLD:
+                    self._cache.move_to_end(key)
+                    return self._cache[key]
+        return None
+
+    def _cache_answer(
+        self,
+        key: str,
+        scope: str,
+        q_emb: Optional[np.ndarray],
+        answer: str
+    ) -> None:
+        """Insert an answer into the LRU cache, evicting the oldest entry"""
+        self._cache[key] = answer
+        self._cache.move_to_end(key)
+        if q_emb is not None:
+            self._cache_embeddings[key] = (scope, q_emb)
+
+        while len(self._cache) > self.CACHE_CAPACITY:
+            old_key, _ = self._cache.popitem(last=False)
+            self._cache_embeddings.pop(old_key, None)
+
     def _answer_simple(
         self,
         question: str,
@@ -154,15 +235,24 @@ class QueryEngine:
         Returns:
             Generated answer
         """
-        # Simple keyword matching for V1
-        question_lower = question.lower()
+        # Simple keyword matching for V1: count matching question tokens per
+        # item via the context's inverted index (RAW events); other items
+        # (summaries) are not indexed and are tokenized on the fly
+        question_tokens = tokenize(question)
+        hits = self.context.match_counts(question_tokens)
+
+        scored = []
+        for item in context_items:
+            if self.context.is_indexed(item):
+                score = hits[id(item)]
+            else:
+                score = len(question_tokens & tokenize(str(item.content)))
+            if score:
+                scored.append((score, item))
 
-        # Extract relevant items
-        relevant_items = []
-        for item in context_items[:10]:  # Check top 10 items
-            content = str(item.content).lower()
-            if any(word in content for word in question_lower.split()):
-                relevant_items.append(item)
+        # Rank by number of matching tokens (stable, so ties keep context order)
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        relevant_items = [item for _, item in scored]
 
         if not relevant_items:
             return "I found some memories but couldn't determine a specific answer. Try rephrasing your question."
@@ -170,14 +260,7 @@ class QueryEngine:
         # Format relevant items as answer
         response_parts = []
         response_parts.append(f"Based on your memories, here's what I found:\n")
-
-        for item in relevant_items[:5]:  # Max 5 items
-            if isinstance(item, ContextItem):
-                timestamp_str = item.timestamp.strftime("%Y-%m-%d")
-                response_parts.append(f"• {timestamp_str}: {item.content}")
-            elif isinstance(item, ContextSummary):
-                timestamp_str = item.timestamp.strftime("%Y-%m-%d")
-                response_parts.append(f"• {timestamp_str} (summary): {item.content}")
+        response_parts.extend(item.render_for_answer() for item in relevant_items[:5])  # Max 5 items
 
         return "\n".join(response_parts)
 
@@ -185,7 +268,8 @@ class QueryEngine:
         self,
         question: str,
         context_items: List[Any],
-        llm_client: Any
+        llm_client: Any,
+        q_emb: Optional[np.ndarray] = None
     ) -> str:
         """
         Generate answer using LLM (V2)
@@ -194,10 +278,14 @@ class QueryEngine:
             question: User's question
             context_items: Context to use
             llm_client: LLM client
+            q_emb: Normalized question embedding, if already computed
 
         Returns:
             Generated answer
         """
+        # Keep only the most relevant items for the prompt
+        context_items = await self._rank_context(question, context_items, llm_client, q_emb)
+
         # Format context for LLM
         context_str = self._format_context_for_llm(context_items)
 
@@ -205,28 +293,73 @@ class QueryEngine:
         # For V1, return formatted context
         return f"Context:\n{context_str}\n\nQuestion: {question}\n\n[LLM response would be generated here]"
 
-    def _format_context_for_llm(self, context_items: List[Any]) -> str:
-        """Format context items for LLM input"""
-        parts = []
+    async def _rank_context(
+        self,
+        question: str,
+        context_items: List[Any],
+        llm_client: Any,
+        q_emb: Optional[np.ndarray] = None
+    ) -> List[Any]:
+        """
+        Select the LLM_TOP_K items most similar to the question
 
-        for item in context_items:
-            if isinstance(item, ContextItem):
-                timestamp = item.timestamp.strftime("%Y-%m-%d %H:%M")
-                parts.append(f"[{timestamp}] {item.event_type}: {item.content}")
-            elif isinstance(item, ContextSummary):
-                timestamp = item.timestamp.strftime("%Y-%m-%d")
-                parts.append(f"[{timestamp} Summary] {item.content}")
+        Embeds all items in a single batch call (plus the question, unless
+        its embedding q_emb was already computed for the response cache),
+        scores items by cosine similarity and keeps the top K in context
+        order. Returns the items unchanged if there are no more than K of
+        them or the client cannot batch-embed.
+        """
+        embed_batch = getattr(llm_client, "embed_batch", None)
+        if embed_batch is None or len(context_items) <= self.LLM_TOP_K:
+            return context_items
+
+        texts = [str(item.content) for item in context_items]
+        if q_emb is None:
+            texts.insert(0, question)
+        try:
+            embeddings = embed_batch(texts)
+            if inspect.isawaitable(embeddings):
+                embeddings = await embeddings
+        except Exception as e:
+            logger.warning(f"Context embedding failed, using unranked context: {e}")
+            return context_items
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if q_emb is None:
+            q_emb, item_embs = embeddings[0], embeddings[1:]
+        else:
+            item_embs = embeddings
+        norms = np.linalg.norm(item_embs, axis=1) * np.linalg.norm(q_emb)
+        scores = np.divide(
+            item_embs @ q_emb, norms,
+            out=np.zeros(len(item_embs), dtype=np.float32),
+            where=norms > 0
+        )
+
+        top = np.sort(np.argpartition(-scores, self.LLM_TOP_K - 1)[:self.LLM_TOP_K])
+        return [context_items[i] for i in top]
 
-        return "\n".join(parts)
+    def _format_context_for_llm(self, context_items: List[Any]) -> str:
+        """Format context items for LLM input"""
+        return "\n".join(item.render_for_llm() for item in context_items)
 
     def get_query_stats(self) -> Dict[str, Any]:
-        """Get query statistics"""
-        return self.query_stats.copy()
+        """
+        Get query statistics
+
+        Returns:
+            Dict with total_queries, avg_tokens, and layers_used
+            (layer -> access count, most used first)
+        """
+        total_queries = self.query_stats["total_queries"]
+        return {
+            "total_queries": total_queries,
+            "layers_used": dict(self._layers_counter.most_common()),
+            "avg_tokens": self._tokens_sum / total_queries if total_queries else 0
+        }
 
     def reset_stats(self) -> None:
         """Reset query statistics"""
-        self.query_stats = {
-            "total_queries": 0,
-            "layers_used": [],
-            "avg_tokens": 0
-        }
+        self.query_stats = {"total_queries": 0}
+        self._tokens_sum = 0
+        self._layers_counter.clear()
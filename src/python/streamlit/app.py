@@ -4,9 +4,17 @@ DirSoul - 数字大脑 UI
 """
 
 import streamlit as st
-from datetime import datetime, timedelta
-import sys
+from streamlit.errors import StreamlitAPIException
+from datetime import datetime, timedelta, timezone
+import html
+import os
+import time
 from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
 
 # Page configuration
 st.set_page_config(
@@ -16,448 +24,145 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# 2026 Dark Glassmorphism CSS
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=Space+Grotesk:wght@500;700&display=swap');
-
-/* ========== 全局样式 ========== */
-.stApp {
-    background: #0a0a0f;
-    font-family: 'Inter', -apple-system, sans-serif;
-}
-
-/* 隐藏默认元素 */
-.stDeployButton, #MainMenu, footer, .stStatusWidget {
-    display: none !important;
-}
-
-/* ========== 深色玻璃态侧边栏 ========== */
-[data-testid="stSidebar"] {
-    background: linear-gradient(180deg,
-        rgba(20, 20, 30, 0.8) 0%,
-        rgba(10, 10, 15, 0.9) 100%);
-    backdrop-filter: blur(40px) saturate(180%);
-    border-right: 1px solid rgba(255, 255, 255, 0.08);
-    padding: 0 !important;
-}
-
-[data-testid="stSidebar"]::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background:
-        radial-gradient(circle at 20% 30%, rgba(120, 119, 198, 0.15) 0%, transparent 50%),
-        radial-gradient(circle at 80% 70%, rgba(78, 56, 163, 0.15) 0%, transparent 50%);
-    pointer-events: none;
-    z-index: 0;
-}
-
-[data-testid="stSidebar"] > div:first-child {
-    position: relative;
-    z-index: 1;
-    padding: 1.5rem;
-    background: transparent;
-}
-
-/* ========== Logo区域 - 动态发光 ========== */
-.logo-section {
-    text-align: center;
-    padding: 2rem 0;
-    margin-bottom: 1.5rem;
-    position: relative;
-}
-
-.logo-icon {
-    font-size: 4.5rem;
-    filter: drop-shadow(0 0 30px rgba(139, 92, 246, 0.6));
-    animation: pulse-glow 3s ease-in-out infinite;
-}
-
-@keyframes pulse-glow {
-    0%, 100% { filter: drop-shadow(0 0 30px rgba(139, 92, 246, 0.6)); }
-    50% { filter: drop-shadow(0 0 40px rgba(139, 92, 246, 0.9)); }
-}
-
-.logo-title {
-    font-family: 'Space Grotesk', sans-serif;
-    font-size: 2.2rem;
-    font-weight: 700;
-    background: linear-gradient(135deg, #a78bfa 0%, #818cf8 50%, #6366f1 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    margin-top: 0.5rem;
-    letter-spacing: -0.5px;
-}
-
-.logo-subtitle {
-    font-size: 0.8rem;
-    color: rgba(255, 255, 255, 0.45);
-    font-weight: 400;
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    margin-top: 0.5rem;
-}
-
-/* ========== Bento Box风格统计卡片 ========== */
-.bento-grid {
-    display: grid;
-    grid-template-columns: repeat(2, 1fr);
-    gap: 0.75rem;
-    margin: 1rem 0;
-}
-
-.bento-card {
-    background: rgba(255, 255, 255, 0.03);
-    border: 1px solid rgba(255, 255, 255, 0.08);
-    border-radius: 16px;
-    padding: 1.25rem;
-    backdrop-filter: blur(20px);
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    position: relative;
-    overflow: hidden;
-}
-
-.bento-card::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    right: 0;
-    height: 1px;
-    background: linear-gradient(90deg,
-        transparent 0%,
-        rgba(167, 139, 250, 0.5) 50%,
-        transparent 100%);
-}
-
-.bento-card:hover {
-    background: rgba(255, 255, 255, 0.05);
-    border-color: rgba(139, 92, 246, 0.3);
-    transform: translateY(-2px);
-    box-shadow: 0 8px 32px rgba(139, 92, 246, 0.15);
-}
-
-.bento-value {
-    font-family: 'Space Grotesk', sans-serif;
-    font-size: 2rem;
-    font-weight: 700;
-    background: linear-gradient(135deg, #a78bfa 0%, #818cf8 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    line-height: 1;
-}
-
-.bento-label {
-    font-size: 0.7rem;
-    color: rgba(255, 255, 255, 0.5);
-    text-transform: uppercase;
-    letter-spacing: 1.5px;
-    margin-top: 0.5rem;
-}
-
-/* ========== 导航按钮 ========== */
-.nav-item {
-    background: rgba(255, 255, 255, 0.02) !important;
-    border: 1px solid rgba(255, 255, 255, 0.06) !important;
-    border-radius: 14px !important;
-    padding: 1rem 1.25rem !important;
-    margin: 0.5rem 0 !important;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    position: relative;
-    overflow: hidden;
-}
-
-.nav-item::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    width: 3px;
-    height: 100%;
-    background: linear-gradient(180deg, #a78bfa 0%, #818cf8 100%);
-    transform: scaleY(0);
-    transition: transform 0.3s ease;
-}
-
-.nav-item:hover {
-    background: rgba(139, 92, 246, 0.1) !important;
-    border-color: rgba(139, 92, 246, 0.3) !important;
-    transform: translateX(4px);
-}
-
-.nav-item:hover::before {
-    transform: scaleY(1);
-}
-
-/* ========== 主内容区域 ========== */
-.main .block-container {
-    padding-top: 1rem;
-    background: transparent;
-    max-width: 1400px;
-}
-
-/* ========== 页面标题 ========== */
-.page-header {
-    text-align: center;
-    margin-bottom: 3rem;
-    position: relative;
-}
-
-.page-title {
-    font-family: 'Space Grotesk', sans-serif;
-    font-size: 3rem;
-    font-weight: 700;
-    background: linear-gradient(135deg, #e0e7ff 0%, #c7d2fe 50%, #a5b4fc 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    margin-bottom: 0.5rem;
-    letter-spacing: -1px;
-}
-
-.page-subtitle {
-    font-size: 1rem;
-    color: rgba(255, 255, 255, 0.4);
-    font-weight: 300;
-    letter-spacing: 0.5px;
-}
-
-/* ========== 聊天容器 - Glassmorphism ========== */
-.chat-wrapper {
-    background: rgba(255, 255, 255, 0.02);
-    border: 1px solid rgba(255, 255, 255, 0.08);
-    border-radius: 24px;
-    padding: 1.5rem;
-    backdrop-filter: blur(40px) saturate(180%);
-    max-width: 1000px;
-    margin: 0 auto;
-    position: relative;
-}
-
-.chat-wrapper::before {
-    content: '';
-    position: absolute;
-    top: -1px;
-    left: 50%;
-    transform: translateX(-50%);
-    width: 60%;
-    height: 1px;
-    background: linear-gradient(90deg,
-        transparent 0%,
-        rgba(167, 139, 250, 0.5) 50%,
-        transparent 100%);
-}
-
-/* ========== 聊天气泡 ========== */
-.stChatMessage {
-    background: transparent !important;
-    border: none !important;
-    padding: 1.25rem 0 !important;
-}
-
-/* 用户消息 */
-.stChatMessage[data-testid="user-message"] {
-    flex-direction: row-reverse;
-}
-
-.stChatMessage[data-testid="user-message"] > div {
-    background: linear-gradient(135deg,
-        rgba(139, 92, 246, 0.9) 0%,
-        rgba(99, 102, 241, 0.9) 100%) !important;
-    border: 1px solid rgba(167, 139, 250, 0.3) !important;
-    border-radius: 20px 20px 6px 20px !important;
-    padding: 1rem 1.5rem !important;
-    box-shadow:
-        0 4px 24px rgba(139, 92, 246, 0.25),
-        inset 0 1px 0 rgba(255, 255, 255, 0.1);
-    max-width: 65%;
-    backdrop-filter: blur(10px);
-}
-
-/* AI消息 */
-.stChatMessage[data-testid="assistant-message"] > div {
-    background: rgba(255, 255, 255, 0.05) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 20px 20px 20px 6px !important;
-    padding: 1rem 1.5rem !important;
-    backdrop-filter: blur(20px) saturate(180%);
-    max-width: 65%;
-}
-
-.stChatMessage[data-testid="assistant-message"] p {
-    color: rgba(255, 255, 255, 0.9);
-}
-
-/* ========== 输入框 ========== */
-.stChatInputContainer {
-    background: rgba(255, 255, 255, 0.03) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 20px !important;
-    padding: 0.5rem !important;
-    backdrop-filter: blur(30px) saturate(180%);
-    transition: all 0.3s ease !important;
-}
-
-.stChatInputContainer:focus-within {
-    border-color: rgba(139, 92, 246, 0.5) !important;
-    box-shadow: 0 0 0 3px rgba(139, 92, 246, 0.1) !important;
-}
-
-.stChatInputContainer > div {
-    background: transparent !important;
-}
-
-.stChatInput textarea {
-    background: transparent !important;
-    color: white !important;
-    border: none !important;
-    font-size: 0.95rem;
-}
-
-.stChatInput textarea::placeholder {
-    color: rgba(255, 255, 255, 0.35);
-}
-
-/* 发送按钮 */
-.stChatInputContainer button {
-    background: linear-gradient(135deg, #8b5cf6 0%, #6366f1 100%) !important;
-    border: none !important;
-    border-radius: 14px !important;
-    width: 44px;
-    height: 44px;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-}
-
-.stChatInputContainer button:hover {
-    transform: scale(1.08);
-    box-shadow: 0 4px 20px rgba(139, 92, 246, 0.5);
-}
-
-/* ========== Metric卡片 ========== */
-[data-testid="stMetricValue"] {
-    color: white !important;
-    font-family: 'Space Grotesk', sans-serif;
-    font-size: 2.5rem !important;
-    font-weight: 700 !important;
-    background: linear-gradient(135deg, #a78bfa 0%, #818cf8 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-}
-
-[data-testid="stMetricDelta"] {
-    font-size: 0.9rem !important;
-    color: rgba(255, 255, 255, 0.5) !important;
-}
-
-/* ========== 标签和标题 ========== */
-label {
-    color: rgba(255, 255, 255, 0.7) !important;
-    font-weight: 500 !important;
-    font-size: 0.9rem;
-}
-
-h1, h2, h3 {
-    color: white !important;
-    font-weight: 600 !important;
-}
-
-/* ========== 按钮 ========== */
-.stButton > button {
-    background: linear-gradient(135deg, #8b5cf6 0%, #6366f1 100%) !important;
-    border: none !important;
-    border-radius: 14px !important;
-    padding: 0.85rem 2rem !important;
-    color: white !important;
-    font-weight: 600 !important;
-    font-size: 0.9rem !important;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    box-shadow: 0 4px 14px rgba(139, 92, 246, 0.3) !important;
-}
-
-.stButton > button:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 8px 25px rgba(139, 92, 246, 0.4) !important;
-}
-
-/* ========== Expander ========== */
-.streamlit-expanderHeader {
-    background: rgba(255, 255, 255, 0.04) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 16px !important;
-    color: white !important;
-    transition: all 0.3s ease !important;
-}
-
-.streamlit-expanderHeader:hover {
-    background: rgba(139, 92, 246, 0.1) !important;
-    border-color: rgba(139, 92, 246, 0.3) !important;
-}
-
-.streamlit-expanderContent {
-    background: rgba(255, 255, 255, 0.02) !important;
-    border: 1px solid rgba(255, 255, 255, 0.08) !important;
-    border-radius: 16px !important;
-}
-
-/* ========== 滚动条 ========== */
-::-webkit-scrollbar {
-    width: 6px;
-}
-
-::-webkit-scrollbar-track {
-    background: rgba(255, 255, 255, 0.02);
-}
-
-::-webkit-scrollbar-thumb {
-    background: linear-gradient(180deg, #8b5cf6 0%, #6366f1 100%);
-    border-radius: 3px;
-}
-
-::-webkit-scrollbar-thumb:hover {
-    background: linear-gradient(180deg, #a78bfa 0%, #818cf8 100%);
-}
-
-/* ========== Info卡片 ========== */
-.info-box {
-    background: rgba(255, 255, 255, 0.03);
-    border: 1px solid rgba(255, 255, 255, 0.08);
-    border-radius: 16px;
-    padding: 1.5rem;
-    margin: 1rem 0;
-    backdrop-filter: blur(20px);
-}
-
-/* ========== Selectbox ========== */
-.stSelectbox > div > div {
-    background: rgba(255, 255, 255, 0.05) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 12px !important;
-}
-
-/* ========== TextInput ========== */
-.stTextInput > div > div > input {
-    background: rgba(255, 255, 255, 0.05) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 12px !important;
-    color: white !important;
-}
-
-/* ========== DateInput ========== */
-.stDateInput > div > div > input {
-    background: rgba(255, 255, 255, 0.05) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 12px !important;
-    color: white !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# 2026 Dark Glassmorphism CSS (static/dirsoul.css), read once per server process
+CSS_PATH = Path(__file__).parent / "static" / "dirsoul.css"
+
+
+@st.cache_resource
+def _css() -> str:
+    """Stylesheet wrapped in a <style> tag"""
+    return f"<style>\n{CSS_PATH.read_text(encoding='utf-8')}</style>"
+
+
+st.markdown(_css(), unsafe_allow_html=True)
+
+
+# DirSoul Rust backend (same variable as the Telegram bot)
+DIRSOUL_API_URL = os.getenv("DIRSOUL_API_URL", "http://localhost:8080").rstrip("/")
+USER_ID = "streamlit_user"
+
+
+@st.cache_resource
+def _http() -> requests.Session:
+    """Pooled HTTP session reused across reruns (keeps backend connections alive)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _post_json(path: str, payload: dict, timeout: float = 15) -> dict:
+    """POST to the backend and decode the JSON body (raises on HTTP errors)"""
+    response = _http().post(f"{DIRSOUL_API_URL}{path}", json=payload, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+# 只读接口缓存 60 秒：切换页面/rerun 不重复请求后端（异常不会被缓存）
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_stats(user_id: str, time_range: str, timeout: float = 15) -> dict:
+    """Cached /api/stats response"""
+    return _post_json("/api/stats", {"user_id": user_id, "time_range": time_range}, timeout)
+
+
+# 侧边栏每次 rerun 都会读取：短超时，失败也缓存 10 秒，后端不可达时不拖慢页面交互
+@st.cache_data(ttl=10, show_spinner=False)
+def _sidebar_stats(user_id: str) -> Optional[dict]:
+    """All-time stats for the sidebar, or None if the backend is unavailable"""
+    try:
+        return _fetch_stats(user_id, "all", timeout=2)
+    except Exception:
+        return None
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_timeline(user_id: str, start_date: str, end_date: str) -> dict:
+    """Cached /api/timeline response (dates as YYYY-MM-DD, end date inclusive)"""
+    return _post_json(
+        "/api/timeline",
+        {"user_id": user_id, "start_date": start_date, "end_date": end_date},
+    )
+
+
+# 洞察页图表数据：DataFrame 每个服务进程只构建一次
+@st.cache_data
+def _weekly_trend() -> pd.DataFrame:
+    """Events per weekday for the insights bar chart"""
+    return pd.DataFrame({"count": [4, 6, 8, 5, 7, 3, 2]}, index=["一", "二", "三", "四", "五", "六", "日"])
+
+
+@st.cache_data
+def _type_distribution() -> pd.DataFrame:
+    """Memory type distribution for the insights bar chart"""
+    return pd.DataFrame({"count": [45, 30, 15, 10]}, index=["对话", "想法", "事件", "笔记"])
+
+
+def _compact(n: int) -> str:
+    """Compact counter for bento cards (2341 -> 2.3K)"""
+    return f"{n / 1000:.1f}K" if n >= 1000 else str(n)
+
+
+def _event_html(event: dict) -> str:
+    """Timeline row for one backend event (time shown in UTC)"""
+    parts = [event.get("actor") or "我", event["action"]]
+    if event.get("target"):
+        parts.append(event["target"])
+    if event.get("quantity") is not None:
+        parts.append(f"{event['quantity']:g}{event.get('unit') or ''}")
+    return f"""
+    <div style="padding: 0.5rem 0; border-left: 2px solid rgba(139,92,246,0.3); padding-left: 1rem;">
+    <div style="color: rgba(255,255,255,0.4); font-size: 0.8rem;">{event["timestamp"][11:16]}</div>
+    <div style="color: white;">{html.escape(" ".join(parts))}</div>
+    </div>
+    """
+
+
+# Chat history: messages rendered per window / kept in session state
+HISTORY_WINDOW = 50
+HISTORY_CAP = 500
+# Roles forwarded to the backend as conversation history
+_ALLOWED_ROLES = frozenset({"user", "assistant"})
+
+# Timeline days rendered per page
+TIMELINE_PAGE_DAYS = 30
+
+# Streaming replies: flush at most every 50ms, and only once 8+ new chars arrived
+STREAM_FLUSH_NS = 50_000_000
+STREAM_FLUSH_CHARS = 8
+
+
+def _render_stream(chunks: Iterable[str]) -> str:
+    """Render streamed text into a single placeholder with throttled updates
+
+    Partial text is shown as plain text; markdown is rendered once on completion.
+    Returns the full text.
+    """
+    placeholder = st.empty()
+    parts, size, flushed = [], 0, 0
+    last_flush = time.monotonic_ns()
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        now = time.monotonic_ns()
+        if now - last_flush >= STREAM_FLUSH_NS and size - flushed >= STREAM_FLUSH_CHARS:
+            placeholder.text("".join(parts))
+            last_flush, flushed = now, size
+    text = "".join(parts)
+    placeholder.markdown(text)
+    return text
+
+
+def _load_earlier():
+    """Extend the rendered history window by one page"""
+    st.session_state.window += HISTORY_WINDOW
+
 
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
+if "window" not in st.session_state:
+    st.session_state.window = HISTORY_WINDOW
 if "current_page" not in st.session_state:
     st.session_state.current_page = "chat"
 
@@ -486,14 +191,21 @@ with st.sidebar:
 
     # Bento Grid Stats
     st.markdown("### 统计")
-    st.markdown("""
+    stats = _sidebar_stats(USER_ID)
+    try:
+        # 后端按 UTC 日期统计
+        today = stats["events_per_day"].get(datetime.now(timezone.utc).date().isoformat(), 0)
+        today_value, total_value = _compact(today), _compact(stats["total_events"])
+    except Exception:
+        today_value = total_value = "—"
+    st.markdown(f"""
     <div class="bento-grid">
         <div class="bento-card">
-            <div class="bento-value">156</div>
+            <div class="bento-value">{today_value}</div>
             <div class="bento-label">今日</div>
         </div>
         <div class="bento-card">
-            <div class="bento-value">2.3K</div>
+            <div class="bento-value">{total_value}</div>
             <div class="bento-label">总数</div>
         </div>
     </div>
@@ -519,44 +231,45 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
-# ========== Main Content ==========
-if page == "💬 对话":
-    st.markdown("""
-    <div class="page-header">
-        <div class="page-title">对话记忆</div>
-        <div class="page-subtitle">记录想法，构建知识</div>
-    </div>
-    """, unsafe_allow_html=True)
 
+# ========== Chat Panel ==========
+# fragment：发送消息只重跑对话区域，不重建 CSS / 侧边栏 / 页面其他部分
+@st.fragment
+def _chat_panel():
+    """Chat history window and input"""
     # Chat messages (不用wrapper，让Streamlit自然布局)
-    for message in st.session_state.messages:
+    # 只渲染最近的窗口，避免每次rerun重绘完整历史
+    window = st.session_state.window
+    if len(st.session_state.messages) > window:
+        st.button("⬆️ 加载更早的消息", on_click=_load_earlier)
+    for message in st.session_state.messages[-window:]:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
-    # Chat input (Streamlit会自动放在底部)
+    # Chat input (fragment 内为行内布局，紧跟消息列表)
     if prompt := st.chat_input("✍️ 输入你的想法..."):
         with st.chat_message("user"):
             st.markdown(prompt)
 
         try:
-            import requests
-            api_url = "http://localhost:8080/api/chat"
+            api_url = f"{DIRSOUL_API_URL}/api/chat"
             payload = {
-                "user_id": "streamlit_user",
+                "user_id": USER_ID,
                 "message": prompt,
-                "history": [{"role": m["role"], "content": m["content"]}
-                           for m in st.session_state.messages if m["role"] in ["user", "assistant"]]
+                # 消息已是 {role, content} 结构，只按角色过滤，不重建 dict
+                "history": [m for m in st.session_state.messages if m["role"] in _ALLOWED_ROLES],
             }
 
-            response = requests.post(api_url, json=payload, timeout=15)
+            response = _http().post(api_url, json=payload, timeout=15)
 
             if response.status_code == 200:
                 data = response.json()
                 assistant_message = data.get("response", "抱歉，我暂时无法回应。")
-                st.session_state.messages = [
-                    {"role": m["role"], "content": m["content"]}
-                    for m in data.get("history", [])
-                ]
+                st.session_state.messages = data.get("history", [])
+                # 新记忆已写入：下次读取统计/时间线时重新请求
+                _fetch_stats.clear()
+                _sidebar_stats.clear()
+                _fetch_timeline.clear()
             else:
                 assistant_message = f"服务不可用 (HTTP {response.status_code})"
                 st.session_state.messages.append({"role": "user", "content": prompt})
@@ -568,9 +281,28 @@ if page == "💬 对话":
             st.session_state.messages.append({"role": "assistant", "content": assistant_message})
 
         with st.chat_message("assistant"):
-            st.markdown(assistant_message)
+            # /api/chat 目前一次返回完整回复；流式接口可直接传入分块迭代器
+            _render_stream((assistant_message,))
+
+        # 限制会话历史长度（后端只使用最近的消息作为上下文）
+        del st.session_state.messages[:-HISTORY_CAP]
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            # 整页运行期间（例如与其他 rerun 合并时）不允许只重跑 fragment
+            st.rerun()
 
-        st.rerun()
+
+# ========== Main Content ==========
+if page == "💬 对话":
+    st.markdown("""
+    <div class="page-header">
+        <div class="page-title">对话记忆</div>
+        <div class="page-subtitle">记录想法，构建知识</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    _chat_panel()
 
 elif page == "📅 时间线":
     st.markdown("""
@@ -588,16 +320,35 @@ elif page == "📅 时间线":
 
     st.markdown("---")
 
-    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
-
-    for date in dates:
-        with st.expander(f"📅 {date.strftime('%Y年%m月%d日')}"):
-            st.markdown("""
-            <div style="padding: 0.5rem 0; border-left: 2px solid rgba(139,92,246,0.3); padding-left: 1rem;">
-            <div style="color: rgba(255,255,255,0.4); font-size: 0.8rem;">09:30</div>
-            <div style="color: white;">记录想法</div>
-            </div>
-            """, unsafe_allow_html=True)
+    try:
+        events_by_date = _fetch_timeline(USER_ID, start_date.isoformat(), end_date.isoformat())["events_by_date"]
+    except Exception as e:
+        events_by_date = {}
+        st.caption(f"⚠️ 无法加载时间线: {e}")
+
+    dates = pd.date_range(start_date, end_date, freq="D")
+    keys = dates.strftime("%Y-%m-%d").tolist()
+    days = dates.strftime("%Y年%m月%d日").tolist()
+    page_start, page_end = 0, len(days)
+
+    # 超过一页时分页显示，避免一次渲染上百个 expander
+    if len(days) > TIMELINE_PAGE_DAYS:
+        page_start = st.selectbox(
+            "页",
+            range(0, len(days), TIMELINE_PAGE_DAYS),
+            format_func=lambda i: f"{days[i]} - {days[min(i + TIMELINE_PAGE_DAYS, len(days)) - 1]}",
+            label_visibility="collapsed",
+            key=f"timeline_page_{start_date}_{end_date}",
+        )
+        page_end = min(page_start + TIMELINE_PAGE_DAYS, len(days))
+
+    for key, label in zip(keys[page_start:page_end], days[page_start:page_end]):
+        events = events_by_date.get(key)
+        with st.expander(f"📅 {label}" + (f" · {len(events)}" if events else "")):
+            if not events:
+                st.caption("暂无记录")
+                continue
+            st.markdown("".join(map(_event_html, events)), unsafe_allow_html=True)
 
 elif page == "📊 洞察":
     st.markdown("""
@@ -622,13 +373,11 @@ elif page == "📊 洞察":
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("### 📈 每日趋势")
-        chart_data = {"一": 4, "二": 6, "三": 8, "四": 5, "五": 7, "六": 3, "日": 2}
-        st.bar_chart(chart_data, use_container_width=True, color="#8b5cf6")
+        st.bar_chart(_weekly_trend(), color="#8b5cf6")
 
     with col2:
         st.markdown("### 🎯 类型分布")
-        type_data = {"对话": 45, "想法": 30, "事件": 15, "笔记": 10}
-        st.bar_chart(type_data, use_container_width=True, color="#6366f1")
+        st.bar_chart(_type_distribution(), color="#6366f1")
 
 elif page == "⚙️ 设置":
     st.markdown("""
@@ -6,6 +6,7 @@ Communicates with the DirSoul Rust HTTP API.
 # Example
 ```python
 client = DirSoulAPI("http://127.0.0.1:8080")
+await client.startup()
 
 # Send chat message
 response = await client.send_chat("user123", "I ate 2 apples")
@@ -15,16 +16,35 @@ stats = await client.get_stats("user123", "30d")
 
 # Get timeline
 timeline = await client.get_timeline("user123", start_date, end_date)
+
+await client.shutdown()
 ```
 """
 
 import logging
+import os
 import aiohttp
+import orjson
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Optional override, e.g. DIRSOUL_API_LOG_LEVEL=CRITICAL to silence request errors
+if _log_level := os.getenv("DIRSOUL_API_LOG_LEVEL"):
+    # getLevelName() maps known level names to ints; anything else is ignored
+    if isinstance(_level := logging.getLevelName(_log_level.upper()), int):
+        logger.setLevel(_level)
+    else:
+        logger.warning("Ignoring invalid DIRSOUL_API_LOG_LEVEL: %r", _log_level)
+
+
+# Shared empty history (serializes as [] without allocating per request)
+_EMPTY: tuple = ()
+
+# Request bodies are pre-encoded with orjson, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class DirSoulAPI:
     """Async HTTP client for DirSoul Rust API"""
@@ -39,11 +59,26 @@ class DirSoulAPI:
         self.base_url = base_url.rstrip("/")
         self.session: Optional[aiohttp.ClientSession] = None
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session"""
+    async def startup(self):
+        """
+        Create the shared HTTP session
+
+        One pooled session is reused for the life of the process, so calls
+        keep their connections alive instead of reconnecting per request.
+        """
         if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
             timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def shutdown(self):
+        """Close the shared HTTP session"""
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            await self.startup()
         return self.session
 
     async def close(self):
@@ -51,6 +86,39 @@ class DirSoulAPI:
         if self.session and not self.session.closed:
             await self.session.close()
 
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a request and decode the JSON response
+
+        Args:
+            method: HTTP method ("GET" or "POST")
+            path: API path (e.g., "/api/chat")
+            action: Request name used in the error log
+            payload: JSON body (optional)
+
+        Returns:
+            Decoded JSON response
+        """
+        session = await self._get_session()
+        # orjson works on bytes both ways: no str round-trip for the body or the response
+        data, headers = (orjson.dumps(payload), _JSON_HEADERS) if payload is not None else (None, None)
+
+        try:
+            async with session.request(
+                method, f"{self.base_url}{path}", data=data, headers=headers
+            ) as response:
+                response.raise_for_status()
+                return orjson.loads(await response.read())
+        except Exception as e:
+            logger.error("%s failed: %s", action, e)
+            raise
+
     # ========================================================================
     # Health Check
     # ========================================================================
@@ -62,16 +130,7 @@ class DirSoulAPI:
         Returns:
             Dict with health status information
         """
-        session = await self._get_session()
-        url = f"{self.base_url}/health"
-
-        try:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                return await response.json()
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            raise
+        return await self._request("GET", "/health", "Health check")
 
     # ========================================================================
     # Chat API
@@ -96,23 +155,16 @@ class DirSoulAPI:
         Returns:
             Dict with response, updated history, and metadata
         """
-        session = await self._get_session()
-        url = f"{self.base_url}/api/chat"
-
         payload = {
             "message": message,
             "user_id": user_id,
-            "history": history or [],
-            "context": context
+            "history": history if history else _EMPTY
         }
+        # Optional fields are omitted rather than sent as null (serde defaults them to None)
+        if context is not None:
+            payload["context"] = context
 
-        try:
-            async with session.post(url, json=payload) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as e:
-            logger.error(f"Chat request failed: {e}")
-            raise
+        return await self._request("POST", "/api/chat", "Chat request", payload)
 
     # ========================================================================
     # Timeline API
@@ -137,26 +189,18 @@ class DirSoulAPI:
         Returns:
             Dict with events_by_date, total_events, and summary
         """
-        session = await self._get_session()
-        url = f"{self.base_url}/api/timeline"
-
         if end_date is None:
-            end_date = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+            end_date = datetime.now().isoformat(timespec="seconds")
 
         payload = {
             "user_id": user_id,
             "start_date": start_date,
-            "end_date": end_date,
-            "filters": filters
+            "end_date": end_date
         }
+        if filters is not None:
+            payload["filters"] = filters
 
-        try:
-            async with session.post(url, json=payload) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as e:
-            logger.error(f"Timeline request failed: {e}")
-            raise
+        return await self._request("POST", "/api/timeline", "Timeline request", payload)
 
     # ========================================================================
     # Statistics API
@@ -177,21 +221,12 @@ class DirSoulAPI:
         Returns:
             Dict with total_memories, total_events, entities, etc.
         """
-        session = await self._get_session()
-        url = f"{self.base_url}/api/stats"
-
         payload = {
             "user_id": user_id,
             "time_range": time_range
         }
 
-        try:
-            async with session.post(url, json=payload) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as e:
-            logger.error(f"Stats request failed: {e}")
-            raise
+        return await self._request("POST", "/api/stats", "Stats request", payload)
 
     # ========================================================================
     # Helper Methods
@@ -212,8 +247,8 @@ class DirSoulAPI:
         start = end - timedelta(days=days)
 
         return (
-            start.strftime("%Y-%m-%dT%H:%M:%S"),
-            end.strftime("%Y-%m-%dT%H:%M:%S")
+            start.isoformat(timespec="seconds"),
+            end.isoformat(timespec="seconds")
         )
 
     @staticmethod
@@ -227,22 +262,17 @@ class DirSoulAPI:
         Returns:
             Formatted event string
         """
-        actor = event.get("actor") or "You"
-        action = event.get("action", "did something")
-        target = event.get("target", "")
+        parts = [event.get("actor") or "You", event.get("action", "did something")]
 
-        text = f"{actor} {action}"
+        target = event.get("target")
         if target:
-            text += f" {target}"
+            parts.append(target)
 
         quantity = event.get("quantity")
-        unit = event.get("unit")
         if quantity is not None:
-            text += f" {quantity}"
-            if unit:
-                text += f"{unit}"
+            parts.append(f"{quantity}{event.get('unit') or ''}")
 
-        return text
+        return " ".join(parts)
 
 
 # ============================================================================
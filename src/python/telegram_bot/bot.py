@@ -17,12 +17,16 @@ python bot.py
 
 import logging
 import os
+import re
 import sys
 import asyncio
-from datetime import datetime
+import functools
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from cachetools import TTLCache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -35,6 +39,7 @@ from telegram.ext import (
 sys.path.insert(0, str(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from api_client import DirSoulAPI
+from formatters import format_stats, format_timeline
 
 # Configure logging
 logging.basicConfig(
@@ -57,6 +62,26 @@ if not TELEGRAM_BOT_TOKEN:
     logger.error("Please set it with: export TELEGRAM_BOT_TOKEN='your_token_here'")
     sys.exit(1)
 
+# Update delivery: "polling" (default, no public URL needed) or "webhook"
+BOT_MODE = os.getenv("BOT_MODE", "polling").lower()
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")  # Public HTTPS URL Telegram posts updates to
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+
+if BOT_MODE not in ("polling", "webhook"):
+    logger.error("Invalid BOT_MODE: %s. Expected: polling or webhook", BOT_MODE)
+    sys.exit(1)
+
+if BOT_MODE == "webhook" and not WEBHOOK_URL:
+    logger.error("WEBHOOK_URL environment variable not set (required when BOT_MODE=webhook)!")
+    sys.exit(1)
+
+
+# Max backend requests in flight; extra updates wait in-process instead of piling onto the API
+API_CONCURRENCY = int(os.getenv("API_CONCURRENCY", "64"))
+
 
 # ============================================================================
 # API Client
@@ -64,19 +89,103 @@ if not TELEGRAM_BOT_TOKEN:
 
 api_client = DirSoulAPI(base_url=DIRSOUL_API_URL)
 
+# Bounds concurrent api_client calls to API_CONCURRENCY
+_api_slots = asyncio.Semaphore(API_CONCURRENCY)
+
+# /timeline window when no argument is given
+DEFAULT_TIMELINE_DAYS = 7
+
+# /stats time ranges accepted by the API
+_VALID_RANGES = frozenset(("7d", "30d", "90d", "all"))
+
+# Precomputed /timeline windows for the usual day counts
+_COMMON_DELTAS = {d: timedelta(days=d) for d in (1, 7, 14, 30, 90)}
+
+# Short-lived cache for read-only API responses, keyed by (user_id, endpoint, args).
+# Repeated /stats or /timeline calls within a minute skip the backend round-trip.
+_response_cache = TTLCache(maxsize=1024, ttl=60)
+
+
+async def _cached(key, fetch):
+    """Return the cached response for key, awaiting fetch() on a miss"""
+    try:
+        return _response_cache[key]
+    except KeyError:
+        pass
+    async with _api_slots:
+        response = await fetch()
+    _response_cache[key] = response
+    return response
+
+
+def _timeline_range(days: int) -> tuple[str, str]:
+    """
+    Timeline bounds for the last N days, bucketed to whole (UTC) days
+
+    Repeated calls produce identical backend queries and cache keys. The
+    backend reads YYYY-MM-DD bounds as start 00:00:00 / end 23:59:59.
+    """
+    today = datetime.now(timezone.utc).date()
+    delta = _COMMON_DELTAS.get(days) or timedelta(days=days)
+    return (today - delta).isoformat(), today.isoformat()
+
+
+def _invalidate_user(user_id: str) -> None:
+    """Drop a user's cached responses (after a new memory is recorded)"""
+    for key in [k for k in _response_cache if k[0] == user_id]:
+        _response_cache.pop(key, None)
+
+
+# Characters with meaning in Telegram's legacy Markdown parse mode
+_MD_ESCAPE = re.compile(r"([_*`\[])")
+
+
+def _md_escape(text: str) -> str:
+    """Escape free text (e.g. backend replies) for ParseMode.MARKDOWN"""
+    return _MD_ESCAPE.sub(r"\\\1", text)
+
+
+async def _reply_error(update: Update, prefix: str, exc: Exception) -> None:
+    """Reply with a failure message followed by the error detail"""
+    await update.message.reply_text(f"❌ {prefix}\n\n(Error: {exc})")
+
+
+def safe_handler(log_message: str, reply_prefix: str):
+    """
+    Wrap a handler so any exception is logged and answered with an error reply
+
+    Args:
+        log_message: Log line prefix (e.g., "Error getting stats")
+        reply_prefix: User-facing failure message passed to _reply_error()
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+            try:
+                await handler(update, context)
+            except Exception as e:
+                logger.error("%s: %s", log_message, e, exc_info=True)
+                await _reply_error(update, reply_prefix, e)
+        return wrapper
+    return decorator
+
+
+async def _send_typing(update: Update) -> None:
+    """Send the typing indicator; failures are logged, never raised"""
+    try:
+        await update.message.chat.send_action("typing")
+    except Exception as e:
+        logger.warning("Could not send typing action: %s", e)
+
 
 # ============================================================================
-# Command Handlers
+# Message Templates (built once at import)
 # ============================================================================
 
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle /start command - bot initialization"""
-    user = update.effective_user
-
-    welcome_message = f"""
+WELCOME_TEMPLATE = """
 🧠 *Welcome to DirSoul - Your Digital Brain*
 
-Hi {user.first_name}! I'm your personal memory assistant.
+Hi {name}! I'm your personal memory assistant.
 
 *Quick Start:*
 • Just send me any message to record a memory
@@ -90,17 +199,9 @@ Hi {user.first_name}! I'm your personal memory assistant.
 ✓ Anything you want to track over time
 
 Your data is stored locally and encrypted. 🔒
-    """.strip()
-
-    await update.message.reply_text(
-        welcome_message,
-        parse_mode="Markdown"
-    )
-
+""".strip()
 
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle /help command - show available commands"""
-    help_text = """
+HELP_TEXT = """
 🧠 *DirSoul Commands*
 
 *Memory Recording:*
@@ -121,111 +222,83 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 • Be specific: "Meeting with John about Project X"
 
 _V1版本 - 更多功能开发中..._
-    """.strip()
+""".strip()
+
+# Acknowledgement appended to plain-text message replies
+RECORDED_SUFFIX = "\n\n✓ Recorded"
+
+
+# ============================================================================
+# Command Handlers
+# ============================================================================
+
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /start command - bot initialization"""
+    user = update.effective_user
+
+    welcome_message = WELCOME_TEMPLATE.format(name=user.first_name)
 
     await update.message.reply_text(
-        help_text,
-        parse_mode="Markdown"
+        welcome_message,
+        parse_mode=ParseMode.MARKDOWN
     )
 
 
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /help command - show available commands"""
+    await update.message.reply_text(
+        HELP_TEXT,
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+
+@safe_handler("Error getting stats", "Sorry, couldn't fetch statistics. Please try again later.")
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /stats command - show user statistics"""
     user_id = str(update.effective_user.id)
 
     # Get time range from args (default: 30d)
     time_range = "30d"
-    if context.args and context.args[0] in ["7d", "30d", "90d", "all"]:
+    if context.args and context.args[0] in _VALID_RANGES:
         time_range = context.args[0]
 
-    try:
-        stats = await api_client.get_stats(user_id, time_range)
-
-        stats_message = f"""
-📊 *Your DirSoul Statistics* ({time_range})
-
-*Overview:*
-• Total Events: {stats['total_events']}
-• Total Entities: {stats['total_entities']}
-
-*Top Event Types:*
-"""
-
-        # Add top 5 event types
-        event_types = sorted(
-            stats['event_types'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-
-        for action, count in event_types:
-            stats_message += f"• {action}: {count}\n"
-
-        if stats['events_per_day']:
-            most_active = max(stats['events_per_day'].items(), key=lambda x: x[1])
-            stats_message += f"\n*Most Active Day:* {most_active[0]} ({most_active[1]} events)\n"
+    stats = await _cached(
+        (user_id, "stats", time_range),
+        lambda: api_client.get_stats(user_id, time_range),
+    )
 
-        await update.message.reply_text(stats_message, parse_mode="Markdown")
-
-    except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        await update.message.reply_text(
-            f"❌ Sorry, couldn't fetch statistics. Please try again later.\n\n(Error: {str(e)})"
-        )
+    await update.message.reply_text(format_stats(stats, time_range), parse_mode=ParseMode.MARKDOWN)
 
 
+@safe_handler("Error getting timeline", "Sorry, couldn't fetch timeline. Please try again later.")
 async def timeline_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /timeline command - show recent timeline"""
     user_id = str(update.effective_user.id)
 
     # Get days from args (default: 7)
-    days = 7
+    days = DEFAULT_TIMELINE_DAYS
     if context.args and context.args[0].isdigit():
         days = int(context.args[0])
 
     # Calculate date range
-    end_date = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-    start_date = (datetime.now() - __import__("datetime").timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
-
-    try:
-        timeline = await api_client.get_timeline(user_id, start_date, end_date)
+    start_date, end_date = _timeline_range(days)
 
-        if timeline['total_events'] == 0:
-            await update.message.reply_text(
-                f"📅 No events found in the last {days} days.\n\n"
-                f"Start recording memories by sending me a message!"
-            )
-            return
-
-        timeline_message = f"📅 *Your Timeline* (Last {days} days)\n\n"
-
-        # Show up to 20 most recent events
-        events_shown = 0
-        for date, events in sorted(timeline['events_by_date'].items(), reverse=True):
-            if events_shown >= 20:
-                break
-
-            timeline_message += f"*{date}*\n"
-            for event in events[:5]:  # Max 5 events per day
-                actor = event['actor'] or "You"
-                quantity = f" {event['quantity']}{event['unit']}" if event.get('quantity') else ""
-                timeline_message += f"  • {actor} {event['action']}{quantity}\n"
-                events_shown += 1
-
-            if events_shown >= 20:
-                timeline_message += f"\n_... and more_"
-                break
-            timeline_message += "\n"
-
-        await update.message.reply_text(timeline_message, parse_mode="Markdown")
+    timeline = await _cached(
+        (user_id, "timeline", start_date, end_date),
+        lambda: api_client.get_timeline(user_id, start_date, end_date),
+    )
 
-    except Exception as e:
-        logger.error(f"Error getting timeline: {e}")
+    if timeline['total_events'] == 0:
         await update.message.reply_text(
-            f"❌ Sorry, couldn't fetch timeline. Please try again later.\n\n(Error: {str(e)})"
+            f"📅 No events found in the last {days} days.\n\n"
+            f"Start recording memories by sending me a message!"
         )
+        return
+
+    await update.message.reply_text(format_timeline(timeline, days), parse_mode=ParseMode.MARKDOWN)
 
 
+@safe_handler("Error recording memory", "Sorry, couldn't record memory. Please try again later.")
 async def record_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /record command - explicit record command"""
     user_id = str(update.effective_user.id)
@@ -240,25 +313,24 @@ async def record_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     text = " ".join(context.args)
 
-    # Show typing indicator
-    await update.message.chat.send_action("typing")
+    # Show typing indicator while the backend works
+    typing = asyncio.create_task(_send_typing(update))
 
     try:
-        response = await api_client.send_chat(user_id, text)
+        async with _api_slots:
+            response = await api_client.send_chat(user_id, text)
+    finally:
+        await typing
+    _invalidate_user(user_id)
 
-        await update.message.reply_text(
-            f"✅ *Memory Recorded!* 🧠\n\n{response['response']}\n\n"
-            f"_Processed in {response['processing_time_ms']}ms_",
-            parse_mode="Markdown"
-        )
-
-    except Exception as e:
-        logger.error(f"Error recording memory: {e}")
-        await update.message.reply_text(
-            f"❌ Sorry, couldn't record memory. Please try again later.\n\n(Error: {str(e)})"
-        )
+    await update.message.reply_text(
+        f"✅ *Memory Recorded!* 🧠\n\n{_md_escape(response['response'])}\n\n"
+        f"_Processed in {response['processing_time_ms']}ms_",
+        parse_mode=ParseMode.MARKDOWN
+    )
 
 
+@safe_handler("Error handling message", "Sorry, couldn't process your message. Please try again later.")
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle regular text messages - record as memory"""
     user_id = str(update.effective_user.id)
@@ -267,26 +339,18 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not text:
         return
 
-    # Show typing indicator
-    await update.message.chat.send_action("typing")
+    # Show typing indicator while the backend works
+    typing = asyncio.create_task(_send_typing(update))
 
     try:
-        response = await api_client.send_chat(user_id, text)
-
-        # Format response
-        response_text = response['response']
-
-        # Add success indicator
-        await update.message.reply_text(
-            f"{response_text}\n\n_✓ Recorded_",
-            parse_mode="Markdown"
-        )
+        async with _api_slots:
+            response = await api_client.send_chat(user_id, text)
+    finally:
+        await typing
+    _invalidate_user(user_id)
 
-    except Exception as e:
-        logger.error(f"Error handling message: {e}")
-        await update.message.reply_text(
-            f"❌ Sorry, couldn't process your message. Please try again later.\n\n(Error: {str(e)})"
-        )
+    # Plain text: the backend reply needs no escaping and Telegram skips Markdown parsing
+    await update.message.reply_text(response['response'] + RECORDED_SUFFIX)
 
 
 # ============================================================================
@@ -295,7 +359,21 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Log errors caused by updates"""
-    logger.error(f"Exception while handling an update: {context.error}", exc_info=context.error)
+    logger.error("Exception while handling an update: %s", context.error, exc_info=context.error)
+
+
+# ============================================================================
+# Lifecycle
+# ============================================================================
+
+async def post_init(application: Application) -> None:
+    """Open the shared API session once the event loop is running"""
+    await api_client.startup()
+
+
+async def post_shutdown(application: Application) -> None:
+    """Close the shared API session"""
+    await api_client.shutdown()
 
 
 # ============================================================================
@@ -305,27 +383,55 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
 def main() -> None:
     """Start the bot"""
     logger.info("🧠 DirSoul Telegram Bot starting...")
-    logger.info(f"API URL: {DIRSOUL_API_URL}")
+    logger.info("API URL: %s", DIRSOUL_API_URL)
+
+    # libuv event loop: lower per-await overhead for the bot and aiohttp I/O.
+    # Optional - unavailable on Windows, where the default asyncio loop is used.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
 
     # Create the Application
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
-    # Register command handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("stats", stats_command))
-    application.add_handler(CommandHandler("timeline", timeline_command))
-    application.add_handler(CommandHandler("record", record_command))
+    # Register command handlers. block=False: a slow backend call for one user
+    # doesn't hold up everyone else's updates (_api_slots bounds the concurrency)
+    application.add_handler(CommandHandler("start", start_command, block=False))
+    application.add_handler(CommandHandler("help", help_command, block=False))
+    application.add_handler(CommandHandler("stats", stats_command, block=False))
+    application.add_handler(CommandHandler("timeline", timeline_command, block=False))
+    application.add_handler(CommandHandler("record", record_command, block=False))
 
     # Register message handler (for non-command text messages)
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message, block=False))
 
     # Register error handler
     application.add_error_handler(error_handler)
 
     # Start the bot
-    logger.info("Bot is running! Press Ctrl+C to stop.")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if BOT_MODE == "webhook":
+        # Telegram pushes updates to us: no long-poll round trips or idle getUpdates calls
+        logger.info("Webhook listening on %s:%s/%s", WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH)
+        logger.info("Bot is running! Press Ctrl+C to stop.")
+        application.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=WEBHOOK_URL,
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES,
+        )
+    else:
+        logger.info("Bot is running! Press Ctrl+C to stop.")
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 
 if __name__ == "__main__":
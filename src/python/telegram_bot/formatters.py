@@ -0,0 +1,86 @@
+"""
+DirSoul Telegram Bot - Reply Formatters
+
+Pure functions turning DirSoul API responses into Telegram Markdown replies.
+No I/O and fully type-hinted, so the module can optionally be compiled with
+mypyc (`mypyc formatters.py`) without changing the bot.
+
+# Example
+```python
+text = format_stats(await client.get_stats("user123", "30d"), "30d")
+```
+"""
+
+import heapq
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, List
+
+# Timeline event fields used when rendering (always present in the API response)
+_event_fields = itemgetter('actor', 'action', 'quantity', 'unit')
+
+_by_count = itemgetter(1)
+
+
+def format_stats(stats: Dict[str, Any], time_range: str) -> str:
+    """
+    Format a /api/stats response
+
+    Args:
+        stats: Statistics response
+        time_range: Time range the statistics cover (e.g., "30d")
+
+    Returns:
+        Markdown reply text
+    """
+    parts: List[str] = [f"""
+📊 *Your DirSoul Statistics* ({time_range})
+
+*Overview:*
+• Total Events: {stats['total_events']}
+• Total Entities: {stats['total_entities']}
+
+*Top Event Types:*
+"""]
+
+    # Add top 5 event types
+    event_types = heapq.nlargest(5, stats['event_types'].items(), key=_by_count)
+
+    parts.extend(f"• {action}: {count}\n" for action, count in event_types)
+
+    if stats['events_per_day']:
+        most_active = max(stats['events_per_day'].items(), key=_by_count)
+        parts.append(f"\n*Most Active Day:* {most_active[0]} ({most_active[1]} events)\n")
+
+    return "".join(parts)
+
+
+def format_timeline(timeline: Dict[str, Any], days: int) -> str:
+    """
+    Format a non-empty /api/timeline response
+
+    Args:
+        timeline: Timeline response
+        days: Number of days the timeline covers
+
+    Returns:
+        Markdown reply text
+    """
+    parts: List[str] = [f"📅 *Your Timeline* (Last {days} days)\n\n"]
+
+    # Show up to 20 most recent events, max 5 per day
+    remaining = 20
+    for date, events in sorted(timeline['events_by_date'].items(), reverse=True):
+        parts.append(f"*{date}*\n")
+        for event in islice(events, min(5, remaining)):
+            actor, action, qty, unit = _event_fields(event)
+            quantity = f" {qty}{unit}" if qty else ""
+            parts.append(f"  • {actor or 'You'} {action}{quantity}\n")
+            remaining -= 1
+
+        if not remaining:
+            parts.append("\n_... and more_")
+            break
+        parts.append("\n")
+
+    return "".join(parts)